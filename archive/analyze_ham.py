@@ -8,7 +8,7 @@ from pathlib import Path
 
 # Import functions from test_spam_detector
 from test_spam_detector import (
-    Config, extract_email_from_pdf, analyze_email, print_email_analysis
+    Config, extract_emails, analyze_emails, print_email_analysis
 )
 
 def main():
@@ -35,20 +35,19 @@ def main():
 
     false_positives = []
 
-    for pdf_file in pdf_files:
-        try:
-            email = extract_email_from_pdf(str(pdf_file))
-            breakdown = analyze_email(email, config)
+    emails = extract_emails(pdf_files)
 
-            print_email_analysis(email, breakdown, config)
+    for email, (breakdown, error) in zip(emails, analyze_emails(emails, config)):
+        if error:
+            print(f"ERROR analyzing {email.filename}: {error}")
+            print("=" * 80)
+            continue
 
-            if breakdown.total_score >= config.spam_threshold:
-                false_positives.append((email, breakdown))
-                print(f"\n⚠️  FALSE POSITIVE - This legitimate email scored {breakdown.total_score} >= {config.spam_threshold}")
-                print("=" * 80)
+        print_email_analysis(email, breakdown, config)
 
-        except Exception as e:
-            print(f"ERROR analyzing {pdf_file.name}: {e}")
+        if breakdown.total_score >= config.spam_threshold:
+            false_positives.append((email, breakdown))
+            print(f"\n⚠️  FALSE POSITIVE - This legitimate email scored {breakdown.total_score} >= {config.spam_threshold}")
             print("=" * 80)
 
     # Summary
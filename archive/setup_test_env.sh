@@ -18,6 +18,10 @@ echo "Installing dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+# Optional speedups: not every platform has wheels, and the tests run without them
+echo "Installing optional dependencies..."
+pip install -r requirements-optional.txt || echo "Optional dependencies not installed; continuing without them."
+
 echo ""
 echo "Setup complete! To run the tests:"
 echo "  1. Activate the environment: source venv/bin/activate"
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Check the link and CTA counts against re.findall on tricky HTML.
+
+COUNTED_PATTERNS may be scanned with Hyperscan, whose match reporting
+differs from findall; each case must score exactly as findall counts.
+Exits 1 on any difference.
+"""
+
+import sys
+
+from test_spam_detector import REGEX_PATTERNS, analyze_links
+
+CASES = [
+    # Unterminated tags: each match ends inside the next one's [^>]*? span
+    '<a x href ' * 12,
+    '<a href="x">link</a> ' * 12,
+    '<A HREF=x> Click Here, learn more, apply now',
+]
+
+
+def expected_counts(html):
+    """Return the (link, CTA) counts analyze_links should report."""
+    return tuple(len(REGEX_PATTERNS[name].findall(html))
+                 for name in ('link_tags', 'cta_patterns'))
+
+
+def main():
+    failures = 0
+    for html in CASES:
+        link_count, cta_count = expected_counts(html)
+        _, reasons = analyze_links(html, html.lower())
+        expected = []
+        if link_count > 5:
+            expected.append(f'links ({link_count})')
+        if cta_count >= 2:
+            expected.append(f'CTAs ({cta_count})')
+        if all(any(part in reason for reason in reasons) for part in expected):
+            print(f'✅ {html[:40]!r}: {reasons}')
+        else:
+            failures += 1
+            print(f'❌ {html[:40]!r}: expected {expected}, got {reasons}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Count how often each v6.0 pattern fires on the spam and ham examples.
+
+analyze_email scans each category in *_SCAN_ORDER and stops as soon as
+the outcome is certain, so the patterns that fire most should come first.
+Re-run after adding patterns or examples and paste the printed orders
+into test_v6.py.
+"""
+
+from pathlib import Path
+
+from test_v6 import (
+    CLICKBAIT_SOURCES, FEAR_SOURCES, MARKETING_SOURCES,
+    fold_case, get_patterns, list_eml_files, parse_eml
+)
+
+
+def main():
+    tests_dir = Path(__file__).parent
+    files = (list_eml_files(tests_dir / 'spam_examples') +
+             list_eml_files(tests_dir / 'ham_examples'))
+
+    # Unlike analyze_email, search every pattern so no hit goes uncounted
+    clickbait_patterns, fear_patterns, marketing_patterns = get_patterns()
+    categories = [
+        ('CLICKBAIT', CLICKBAIT_SOURCES, clickbait_patterns, [0] * len(CLICKBAIT_SOURCES)),
+        ('FEAR', FEAR_SOURCES, fear_patterns, [0] * len(FEAR_SOURCES)),
+        ('MARKETING', MARKETING_SOURCES, marketing_patterns, [0] * len(MARKETING_SOURCES)),
+    ]
+    for filepath in files:
+        subject, from_field, _ = parse_eml(filepath)
+        text = fold_case(subject + ' ' + from_field)
+        for name, _, patterns, hits in categories:
+            # Marketing patterns only ever see the From field
+            searched = fold_case(from_field) if name == 'MARKETING' else text
+            for i, pattern in enumerate(patterns):
+                if pattern.search(searched):
+                    hits[i] += 1
+
+    print(f'Pattern hits across {len(files)} examples\n')
+    for name, sources, _, hits in categories:
+        order = sorted(range(len(sources)), key=lambda i: -hits[i])
+        print(f'{name}:')
+        for i in order:
+            print(f'  [{i:2}] {hits[i]:3}  {sources[i][:60]}')
+        print(f'{name}_SCAN_ORDER = {order}\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Pin the v6.0 signals for inputs whose handling changed on purpose.
+
+Each case is (subject, from, expected matched_patterns). Run after
+changing fold_case() or the pattern banks; exits 1 on any difference.
+"""
+
+import sys
+
+from test_v6 import analyze_email
+
+CASES = [
+    # lower() maps U+2126 OHM SIGN to U+03C9, so since patterns match
+    # fold_case() text it counts as Greek obfuscation
+    ('\u2126 meter', 'shop@example.com', ['clickbait[21]']),
+]
+
+
+def main():
+    failures = 0
+    for subject, from_field, expected in CASES:
+        signals, _, _ = analyze_email(subject, from_field, False, collect_matches=True)
+        if signals['matched_patterns'] == expected:
+            print(f'✅ {subject!r}: {expected}')
+        else:
+            failures += 1
+            print(f'❌ {subject!r}: expected {expected}, got {signals["matched_patterns"]}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()